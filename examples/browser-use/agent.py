@@ -1,21 +1,45 @@
 import asyncio
-import requests
+import aiohttp
+import contextlib
+import functools
+import json
 import time
 import re
 import os
 import logging
 import base64
+import hashlib
 from dotenv import load_dotenv
 load_dotenv()
 from browser_use import Agent, BrowserSession
 from browser_use.llm import ChatOpenAI
 from browser_use.actor import Page
 from ppio_sandbox.code_interpreter import Sandbox
-from urllib.parse import urlparse
+from urllib.parse import urlsplit
 
 LLM_BASE_URL = os.getenv("LLM_BASE_URL")
 LLM_MODEL = os.getenv("LLM_MODEL")
 PPIO_API_KEY = os.getenv("PPIO_API_KEY")
+# Screenshot format: "jpeg" (default, smaller and faster to encode), "png" or "webp"
+SCREENSHOT_FORMAT = os.getenv("SCREENSHOT_FORMAT", "jpeg").strip().lower()
+if SCREENSHOT_FORMAT == "jpg":
+  SCREENSHOT_FORMAT = "jpeg"
+if SCREENSHOT_FORMAT not in ("jpeg", "png", "webp"):
+  raise ValueError(f"SCREENSHOT_FORMAT must be one of jpeg, png or webp, got {SCREENSHOT_FORMAT!r}")
+SCREENSHOT_JPEG_QUALITY = 75
+SCREENSHOT_EXT = "jpg" if SCREENSHOT_FORMAT == "jpeg" else SCREENSHOT_FORMAT
+
+_SAFE_HOST_RE = re.compile(r'[^a-zA-Z0-9.-]')
+
+# Screenshot directories already created, so makedirs runs once per session
+_created_dirs = set()
+
+# Digest of the last screenshot written per session, to skip unchanged captures
+_last_screenshot_hash = {}
+
+async def _probe(session, url):
+    async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
+        return response.status, await response.text()
 
 async def test_chrome_connection(host):
     """Test Chrome connection and get debug information"""
@@ -23,98 +47,169 @@ async def test_chrome_connection(host):
     print(f"\n=== Debug Chrome Connection ===")
     print(f"Test host: {host}")
     
-    # Configuration to disable proxy
-    proxies = {
-        'http': None,
-        'https': None,
-    }
+    # The three probes are independent, so run them concurrently over one connection pool
+    async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=4)) as session:
+        basic, targets, version = await asyncio.gather(
+            _probe(session, f"https://{host}/json/version"),
+            _probe(session, f"https://{host}/json"),
+            _probe(session, f"https://{host}/json/version"),
+            return_exceptions=True,
+        )
     
     # Test basic connection
     try:
-        response = requests.get(f"https://{host}/json/version", timeout=10, proxies=proxies)
-        print(f"Basic connection test: {response.status_code}")
-        print(f"Response content: {response.text[:200]}...")
+        if isinstance(basic, Exception):
+            raise basic
+        status, text = basic
+        print(f"Basic connection test: {status}")
+        print(f"Response content: {text[:200]}...")
     except Exception as e:
         print(f"Basic connection failed: {e}")
     
     # Test /json endpoint
     try:
-        response = requests.get(f"https://{host}/json", timeout=10, proxies=proxies)
-        print(f"/json endpoint test: {response.status_code}")
-        if response.status_code == 200:
-            data = response.json()
+        if isinstance(targets, Exception):
+            raise targets
+        status, text = targets
+        print(f"/json endpoint test: {status}")
+        if status == 200:
+            data = json.loads(text)
             print(f"Found {len(data)} targets")
             for i, target in enumerate(data[:2]):  # Only show first 2
                 print(f"  Target {i}: {target.get('type', 'unknown')} - {target.get('url', 'no url')}")
         else:
-            print(f"Response content: {response.text[:200]}...")
+            print(f"Response content: {text[:200]}...")
     except Exception as e:
         print(f"/json endpoint failed: {e}")
     
     # Test /json/version endpoint
     try:
-        response = requests.get(f"https://{host}/json/version", timeout=10, proxies=proxies)
-        print(f"/json/version endpoint test: {response.status_code}")
-        if response.status_code == 200:
-            version_data = response.json()
+        if isinstance(version, Exception):
+            raise version
+        status, text = version
+        print(f"/json/version endpoint test: {status}")
+        if status == 200:
+            version_data = json.loads(text)
             print(f"Chrome version: {version_data.get('Browser', 'unknown')}")
             print(f"WebSocket URL: {version_data.get('webSocketDebuggerUrl', 'not found')}")
         else:
-            print(f"Response content: {response.text[:200]}...")
+            print(f"Response content: {text[:200]}...")
     except Exception as e:
         print(f"/json/version endpoint failed: {e}")
     
     print("=== Debug completed ===\n")
 
 async def get_chrome_wss_url(host):
-  proxies = {
-      'http': None,
-      'https': None,
-  }
   try:
-      response = requests.get(f"https://{host}/json/version", timeout=10, proxies=proxies)
-      print(f"/json/version endpoint test: {response.status_code}")
-      if response.status_code == 200:
-          version_data = response.json()
+      async with aiohttp.ClientSession() as session:
+          status, text = await _probe(session, f"https://{host}/json/version")
+      print(f"/json/version endpoint test: {status}")
+      if status == 200:
+          version_data = json.loads(text)
           print(f"Chrome version: {version_data.get('Browser', 'unknown')}")
           print(f"WebSocket URL: {version_data.get('webSocketDebuggerUrl', 'not found')}")
           return version_data.get('webSocketDebuggerUrl', 'not found')
       else:
-          print(f"Response content: {response.text[:200]}...")
+          print(f"Response content: {text[:200]}...")
           return None
   except Exception as e:
       print(f"/json/version endpoint failed: {e}")
       return None
 
-async def screenshot(page: Page, session_id: str, url: str):
+def _write_image(path, data):
+  directory = os.path.dirname(path)
+  if directory not in _created_dirs:
+    os.makedirs(directory, exist_ok=True)
+    _created_dirs.add(directory)
+  with open(path, "wb", buffering=0) as f:
+    f.write(data)
+
+class ScreenshotWriter:
+  """Write screenshots from a background task so the agent doesn't wait on disk I/O"""
+
+  def __init__(self, maxsize=8):
+    self._queue = asyncio.Queue(maxsize=maxsize)
+    self._task = asyncio.create_task(self._drain())
+
+  async def _drain(self):
+    while True:
+      path, data = await self._queue.get()
+      try:
+        await asyncio.to_thread(_write_image, path, data)
+        print(f"Screenshot saved to {path}")
+      except Exception as e:
+        print(f"Failed to save screenshot {path}: {e}")
+      finally:
+        self._queue.task_done()
+
+  async def put(self, path, data):
+    # Only waits when the queue is full
+    await self._queue.put((path, data))
+
+  async def close(self):
+    """Wait for pending screenshots to be written, then stop the background task"""
+    await self._queue.join()
+    self._task.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+      await self._task
+
+async def _capture(browser_session: BrowserSession, page: Page):
+  """Capture the page and return base64 image data"""
+  quality = SCREENSHOT_JPEG_QUALITY if SCREENSHOT_FORMAT == "jpeg" else None
+  # Call CDP directly so we can pass optimizeForSpeed, which makes Chromium
+  # favour encode speed over output size
+  params = {"format": SCREENSHOT_FORMAT, "optimizeForSpeed": True}
+  if quality is not None:
+    params["quality"] = quality
+  try:
+    capture = await browser_session.cdp_client.send.Page.captureScreenshot(
+      params=params,
+      session_id=await page.session_id,
+    )
+    return capture["data"]
+  except Exception as e:
+    print(f"Fast screenshot failed, falling back to page.screenshot(): {e}")
+    return await page.screenshot(format=SCREENSHOT_FORMAT, quality=quality)
+
+async def screenshot(browser_session: BrowserSession, page: Page, url: str, writer: ScreenshotWriter | None = None):
   print("taking screenshot...")
 
-  screenshot_b64 = await page.screenshot(format='png')
+  session_id = browser_session.id
+  screenshot_b64 = await _capture(browser_session, page)
   
   # Decode base64 to bytes
   screenshot_bytes = base64.b64decode(screenshot_b64)
+
+  # Both step hooks capture the page; skip the write if nothing changed since the last one
+  screenshot_hash = hashlib.blake2b(screenshot_bytes, digest_size=16).digest()
+  if _last_screenshot_hash.get(session_id) == screenshot_hash:
+    print("Screenshot unchanged, skipping save")
+    return
+  _last_screenshot_hash[session_id] = screenshot_hash
   
-  # Write screenshot_bytes to a PNG file in ./screenshots/{session_id}
+  # Write screenshot_bytes to an image file in ./screenshots/{session_id}
   screenshots_dir = os.path.join(".", "screenshots", str(session_id))
-  os.makedirs(screenshots_dir, exist_ok=True)
   # Extract the host (domain) part from the URL and escape it for safe filename usage
 
-  parsed_url = urlparse(url)
+  parsed_url = urlsplit(url)
   host = parsed_url.netloc or parsed_url.path  # fallback if netloc is empty
   # Escape host: replace any non-alphanumeric, non-dot, non-hyphen with underscore
-  safe_host = re.sub(r'[^a-zA-Z0-9.-]', '_', host)
-  screenshot_path = os.path.join(screenshots_dir, f"{safe_host}_{time.time()}.png")
-  with open(screenshot_path, "wb") as f:
-    f.write(screenshot_bytes)
-  print(f"Screenshot saved to {screenshot_path}")
+  safe_host = _SAFE_HOST_RE.sub('_', host)
+  screenshot_path = os.path.join(screenshots_dir, f"{safe_host}_{time.time_ns()}.{SCREENSHOT_EXT}")
+  if writer is not None:
+    # Hand the write to the background writer so the agent can move on
+    await writer.put(screenshot_path, screenshot_bytes)
+  else:
+    await asyncio.to_thread(_write_image, screenshot_path, screenshot_bytes)
+    print(f"Screenshot saved to {screenshot_path}")
 
-async def setp_end_hook(agent: Agent):
+async def setp_end_hook(agent: Agent, writer: ScreenshotWriter | None = None):
   page = await agent.browser_session.get_current_page()
   current_url = await page.get_url()
   visit_log = agent.history.urls()
   previous_url = visit_log[-2] if len(visit_log) >= 2 else None
   print(f"Agent was last on URL: {previous_url} and is now on {current_url}")
-  await screenshot(page, agent.browser_session.id, current_url)
+  await screenshot(agent.browser_session, page, current_url, writer)
 
 async def main():
   print(os.getenv("PPIO_DOMAIN"))
@@ -123,6 +218,7 @@ async def main():
     timeout=600,  # seconds
     template="browser-chromium",
   )
+  screenshot_writer = ScreenshotWriter()
   
   try:
     # Get host and construct complete URL
@@ -163,12 +259,15 @@ async def main():
     # Optional: further customize the log level for this agent instance
     agent.logger.setLevel(logging.DEBUG)
 
+    step_hook = functools.partial(setp_end_hook, writer=screenshot_writer)
     await agent.run(
-      on_step_start=setp_end_hook,
-      on_step_end=setp_end_hook
+      on_step_start=step_hook,
+      on_step_end=step_hook
     )
     await browser_session.stop()
   finally:
+    # Wait for pending screenshots to be written
+    await screenshot_writer.close()
     # Destroy sandbox
     sandbox.kill()
 
@@ -1,72 +1,263 @@
 from __future__ import annotations
 
 import asyncio
+import io
 import re
 import os
+import sys
+import time
 from typing import AsyncIterable, List, Dict, Any, Optional
 
-from openai import AsyncOpenAI
-from ppio_sandbox.code_interpreter import Sandbox
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+from ppio_sandbox.code_interpreter import Context, Sandbox
 
 # Thinking tags for processing model thinking/reasoning
 THINKING_BEGIN_TAG = "<thinking>"
 THINKING_END_TAG = "</thinking>"
 
+# Events yielded by stream_chat_completion as (event, text) tuples
+THINKING_START_EVENT = "thinking_start"  # first reasoning chunk of a reasoning block
+THINKING_EVENT = "thinking"              # further reasoning chunks
+THINKING_END_EVENT = "thinking_end"      # reasoning finished, content follows (text is "")
+CONTENT_EVENT = "content"                # answer content
+
 PPIO_API_KEY = os.getenv("PPIO_API_KEY")
 if not PPIO_API_KEY:
     raise ValueError("environment variable PPIO_API_KEY is not set")
 LLM_BASE_URL = "https://api.ppinfra.com/openai"
 LLM_MODEL = "deepseek/deepseek-v3.2-exp"
+SYSTEM_PROMPT = "You are a helpful coding assistant."
+
+# Sandboxes are kept warm between runs; drop them a little before they time out
+SANDBOX_TIMEOUT = 5 * 60
+SANDBOX_POOL_SIZE = 2
+SANDBOX_EXPIRY_MARGIN = 30
+
+# Markdown code fences around generated code, e.g. ```python ... ```
+_FENCE_RE = re.compile(r"```(?:python)?")
+# Markers that indicate the sandbox execution produced an error
+_ERROR_RE = re.compile(r"Traceback \(most recent call last\):|Error:")
+
+
+def _split_delta(chunk) -> tuple[Optional[str], bool]:
+    """Return (text, is_reasoning) for a streamed chunk, or (None, False) if it carries no text"""
+    if chunk.choices and chunk.choices[0].delta:
+        choice_delta = chunk.choices[0].delta
+        if choice_delta.content:
+            return choice_delta.content, False
+        reasoning_content = getattr(choice_delta, 'reasoning_content', None)
+        if reasoning_content:
+            return reasoning_content, True
+    return None, False
+
+
+def _silent(*args, **kwargs) -> None:
+    pass
+
+
+class StreamPrinter:
+    """Echo streamed text to stdout, flushing every few chunks rather than on each one"""
+
+    def __init__(self, max_chunks: int = 8, max_delay: float = 0.02, enabled: bool = True):
+        self.enabled = enabled
+        self.max_chunks = max_chunks
+        self.max_delay = max_delay
+        self._buffer: List[str] = []
+        self._last_flush = time.monotonic()
+
+    def write(self, text: str) -> None:
+        if not self.enabled:
+            return
+        self._buffer.append(text)
+        if len(self._buffer) >= self.max_chunks or time.monotonic() - self._last_flush > self.max_delay:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._buffer:
+            sys.stdout.write("".join(self._buffer))
+            self._buffer.clear()
+        sys.stdout.flush()
+        self._last_flush = time.monotonic()
+
+
+class WarmSandbox:
+    """A pooled sandbox with its expiry deadline and the fresh code context the next run will use"""
+
+    def __init__(self, sandbox: Sandbox, context: Context):
+        self.sandbox = sandbox
+        self.context = context
+        self.deadline = time.monotonic() + SANDBOX_TIMEOUT - SANDBOX_EXPIRY_MARGIN
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.deadline
 
 
 class PythonCodeInterpreter:
     def __init__(self):
+        # Explicit keep-alive pool and HTTP/2 so successive (and concurrent) streams
+        # reuse the same TLS connection to the LLM API
         self.openai_client = AsyncOpenAI(
             api_key=PPIO_API_KEY,
             base_url=LLM_BASE_URL,
+            http_client=DefaultAsyncHttpxClient(
+                limits=httpx.Limits(
+                    max_keepalive_connections=10,
+                    max_connections=20,
+                    keepalive_expiry=60.0,
+                ),
+                http2=True,
+            ),
         )
         self.temperature = 0.6
         self.max_tokens = 4096
+        # Warm pool of WarmSandbox entries reused across runs. Warm-ups for
+        # concurrent runs may overfill it; released sandboxes are capped at SANDBOX_POOL_SIZE
+        self._sandbox_pool: asyncio.Queue = asyncio.Queue()
+        # Background sandbox warm-ups and context resets, kept referenced until they finish
+        self._sandbox_tasks: set[asyncio.Task] = set()
+
+    async def _kill_sandbox(self, sandbox: Sandbox) -> None:
+        try:
+            await asyncio.to_thread(sandbox.kill)
+        except Exception as cleanup_error:
+            print(f"Failed to cleanup sandbox: {cleanup_error}")
+
+    def _create_sandbox(self) -> WarmSandbox:
+        """Create a sandbox with a code context ready, so a run only has to call run_code"""
+        sandbox = Sandbox.create(timeout=SANDBOX_TIMEOUT)
+        try:
+            return WarmSandbox(sandbox, sandbox.create_code_context())
+        except Exception:
+            sandbox.kill()
+            raise
+
+    async def _acquire_sandbox(self) -> WarmSandbox:
+        """Claim a warm sandbox from the pool, or create a new one if none is available"""
+        while True:
+            try:
+                warm = self._sandbox_pool.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            if not warm.expired:
+                return warm
+            self._start_sandbox_task(self._kill_sandbox(warm.sandbox))
+        creation = self._start_sandbox_task(asyncio.to_thread(self._create_sandbox))
+        try:
+            # Shielded so a cancelled run doesn't abandon a sandbox the thread is still creating
+            return await asyncio.shield(creation)
+        except asyncio.CancelledError:
+            self._start_sandbox_task(self._discard_created_sandbox(creation))
+            raise
 
-    def run_code_in_sandbox(self, code: str) -> str:
+    async def _discard_created_sandbox(self, creation: asyncio.Task) -> None:
+        try:
+            warm = await creation
+        except Exception:
+            return
+        await self._kill_sandbox(warm.sandbox)
+
+    async def _release_sandbox(self, warm: WarmSandbox) -> None:
+        """Give a used sandbox a fresh code context and return it to the pool, or kill it
+        if the pool is full or it is about to expire"""
+        if self._sandbox_pool.qsize() >= SANDBOX_POOL_SIZE or warm.expired:
+            await self._kill_sandbox(warm.sandbox)
+            return
+        try:
+            warm.context = await asyncio.to_thread(warm.sandbox.create_code_context)
+        except Exception as e:
+            print(f"Failed to reset sandbox: {e}")
+            await self._kill_sandbox(warm.sandbox)
+            return
+        if self._sandbox_pool.qsize() >= SANDBOX_POOL_SIZE:
+            await self._kill_sandbox(warm.sandbox)
+        else:
+            self._sandbox_pool.put_nowait(warm)
+
+    async def _warm_up_sandbox(self) -> None:
+        """Create a sandbox in the background and put it in the pool"""
+        # Evict expired sandboxes first so they don't count as warm
+        pooled = [self._sandbox_pool.get_nowait() for _ in range(self._sandbox_pool.qsize())]
+        expired = []
+        for warm in pooled:
+            if warm.expired:
+                expired.append(warm)
+            else:
+                self._sandbox_pool.put_nowait(warm)
+        for warm in expired:
+            await self._kill_sandbox(warm.sandbox)
+        if not self._sandbox_pool.empty():
+            return
+        try:
+            warm = await asyncio.to_thread(self._create_sandbox)
+        except Exception as e:
+            print(f"Failed to warm up sandbox: {e}")
+            return
+        self._sandbox_pool.put_nowait(warm)
+
+    def _start_sandbox_task(self, coro) -> asyncio.Task:
+        task = asyncio.create_task(coro)
+        self._sandbox_tasks.add(task)
+        task.add_done_callback(self._sandbox_tasks.discard)
+        return task
+
+    async def aclose(self) -> None:
+        """Kill all pooled sandboxes and close the LLM client"""
+        if self._sandbox_tasks:
+            await asyncio.gather(*self._sandbox_tasks, return_exceptions=True)
+        while not self._sandbox_pool.empty():
+            warm = self._sandbox_pool.get_nowait()
+            await self._kill_sandbox(warm.sandbox)
+        await self.openai_client.close()
+
+    async def run_code_in_sandbox(self, code: str) -> str:
         """Execute code in PPIO Agent Sandbox and return the output"""
-        sandbox = None
+        warm = None
+        completed = False
+        try:
+            warm = await self._acquire_sandbox()
+            # Each run gets its own code context, removed right after, so no variables,
+            # imports or memory from this run survive into the next one
+            result = await asyncio.to_thread(warm.sandbox.run_code, code, context=warm.context)
+            context, warm.context = warm.context, None
+            await asyncio.to_thread(warm.sandbox.remove_code_context, context)
+            completed = True
+        except Exception as e:
+            return str(e)
+        finally:
+            # Runs on success, error and cancellation alike, in background tasks that
+            # aclose() waits for, so a claimed sandbox is always either pooled or killed
+            if warm is not None:
+                if completed:
+                    # Creating the next context happens off this run's critical path
+                    self._start_sandbox_task(self._release_sandbox(warm))
+                else:
+                    # The run failed or was cancelled; the sandbox may be in a bad state
+                    self._start_sandbox_task(self._kill_sandbox(warm.sandbox))
         try:
-            sandbox = Sandbox.create(timeout=5 * 60)
-            result = sandbox.run_code(code)
             if result.error:
                 return result.error.name + ":" + result.error.value + "\n" + "Traceback:\n" + result.error.traceback
-            output = ""
-            if len(result.results) > 0:
-                output += "results >\n" + "\n".join(result.results)
-            if len(result.logs.stdout) > 0:
-                if output != "":
-                    output += "\n"
-                output += "stdout >\n" + "\n".join(result.logs.stdout)
-            if len(result.logs.stderr) > 0:
-                if output != "":
-                    output += "\n"
-                output += "stderr >\n" + "\n".join(result.logs.stderr)
-            return output
+            output = io.StringIO()
+            for label, lines in (
+                ("results", result.results),
+                ("stdout", result.logs.stdout),
+                ("stderr", result.logs.stderr),
+            ):
+                if lines:
+                    if output.tell():
+                        output.write("\n")
+                    output.write(f"{label} >\n")
+                    output.write("\n".join(lines))
+            return output.getvalue()
         except Exception as e:
             return str(e)
-        finally:
-            if sandbox is not None:
-                try:
-                    sandbox.kill()
-                except Exception as cleanup_error:
-                    print(f"Failed to cleanup sandbox: {cleanup_error}")
-
-    class PartialResponse:
-        def __init__(self, content: Optional[str] = None, reasoning_content: Optional[str] = None):
-            self.content = content
-            self.reasoning_content = reasoning_content
 
     async def stream_chat_completion(
         self, 
         messages: List[Dict[str, Any]]
-    ) -> AsyncIterable[str]:
-        """Stream chat completion from OpenAI API"""
+    ) -> AsyncIterable[tuple[str, str]]:
+        """Stream chat completion from OpenAI API as (event, text) tuples"""
         response = await self.openai_client.chat.completions.create(
             model=LLM_MODEL,
             messages=messages,
@@ -76,13 +267,26 @@ class PythonCodeInterpreter:
             extra_body={"enable_thinking": True},
         )
 
-        async for chunk in response:
-            if chunk.choices and chunk.choices[0].delta:
-                choice_delta = chunk.choices[0].delta
-                if choice_delta.content:
-                    yield self.PartialResponse(content=choice_delta.content)
-                elif hasattr(choice_delta, 'reasoning_content') and choice_delta.reasoning_content:
-                    yield self.PartialResponse(reasoning_content=choice_delta.reasoning_content)
+        # The reasoning state is encoded in which loop is running rather than in a
+        # flag, so each chunk only needs one check; both loops share one iterator
+        chunks = response.__aiter__()
+        async for chunk in chunks:
+            text, is_reasoning = _split_delta(chunk)
+            if text is None:
+                continue
+            if is_reasoning:
+                yield THINKING_START_EVENT, text
+                async for chunk in chunks:
+                    text, is_reasoning = _split_delta(chunk)
+                    if text is None:
+                        continue
+                    if not is_reasoning:
+                        break
+                    yield THINKING_EVENT, text
+                else:
+                    return
+                yield THINKING_END_EVENT, ""
+            yield CONTENT_EVENT, text
 
 
     async def generate_summary(
@@ -90,18 +294,13 @@ class PythonCodeInterpreter:
         messages: List[Dict[str, Any]]
     ) -> AsyncIterable[str]:
         """Stream the summary of code execution result"""
-        reasoning = False
-        async for resp in self.stream_chat_completion(messages):
-            if resp.reasoning_content:
-                if not reasoning:
-                    yield "Thinking...\n"
-                    reasoning = True
-                yield resp.reasoning_content
-            elif resp.content:
-                if reasoning:
-                    yield "\n\n"
-                    reasoning = False
-                yield resp.content
+        async for event, text in self.stream_chat_completion(messages):
+            if event == THINKING_START_EVENT:
+                yield "Thinking...\n"
+            elif event == THINKING_END_EVENT:
+                yield "\n\n"
+                continue
+            yield text
 
 
     async def generate_python_code(
@@ -117,34 +316,34 @@ class PythonCodeInterpreter:
         Returns:
             tuple[str, str]: (display text, collected code snippet)
         """
-        reasoning = False
-        async for resp in self.stream_chat_completion(messages):
-            if resp.content:
-                if reasoning:
-                    yield "\n\n", ""
-                    reasoning = False
-                yield resp.content, resp.content
-            elif resp.reasoning_content:
-                if not reasoning:
-                    yield "Thinking...\n", ""
-                    reasoning = True
-                yield resp.reasoning_content, ""
+        async for event, text in self.stream_chat_completion(messages):
+            if event == CONTENT_EVENT:
+                yield text, text
+                continue
+            if event == THINKING_START_EVENT:
+                yield "Thinking...\n", ""
+            elif event == THINKING_END_EVENT:
+                yield "\n\n", ""
+                continue
+            yield text, ""
 
 
     def remove_markdown_code_fences(self, code_snippet: str) -> str:
         """Remove markdown code fences from code snippet"""
-        return re.sub(r"```(python)?+", "", code_snippet).strip()
+        if "```" not in code_snippet:
+            return code_snippet.strip()
+        return _FENCE_RE.sub("", code_snippet).strip()
 
 
     def has_error(self, result: str) -> bool:
         """Check if execution result contains error"""
-        error_keywords = ["Traceback (most recent call last):", "Error:"]
-        return any(keyword in result for keyword in error_keywords)
+        return _ERROR_RE.search(result) is not None
 
 
     async def run(
         self, 
-        user_message: str
+        user_message: str,
+        echo: bool = True,
     ) -> Dict[str, Any]:
         """
         Execute code generation and execution workflow:
@@ -154,13 +353,23 @@ class PythonCodeInterpreter:
         4. Re-run the updated code on the Python sandbox.
         5. Return the final result (or last error if debugging failed).
         
+        Args:
+            user_message: description of the code to generate
+            echo: stream progress and LLM output to stdout; pass False when running
+                several prompts concurrently
+
         Returns:
             Dict with keys: 'code', 'output', 'has_error', 'debug_code' (if applicable)
         """
+        log = print if echo else _silent
+
         if not user_message:
-            print("Please provide a prompt describing the code you want generated.")
+            log("Please provide a prompt describing the code you want generated.")
             return {"error": "Empty user message"}
 
+        # Boot the sandbox while the LLM is generating code
+        sandbox_warmup = self._start_sandbox_task(self._warm_up_sandbox())
+
         result = {
             "user_message": user_message,
             "code": "",
@@ -174,7 +383,7 @@ class PythonCodeInterpreter:
         # 1) Ask LLM to generate code
         # -------------
         gen_code_prompt = (
-            "You are a helpful coding assistant. The user wants some Python code. "
+            "The user wants some Python code. "
             "Please provide only the Python code (MUST WITH markdown fences) needed to "
             "accomplish the following request:\n\n"
             f"{user_message}\n\n"
@@ -182,27 +391,39 @@ class PythonCodeInterpreter:
             "explain the code."
         )
 
-        messages = [{"role": "user", "content": gen_code_prompt}]
-        code_snippet = ""
+        # The debug and summary steps extend this conversation instead of re-sending
+        # the code in a fresh prompt, so every call shares the same cacheable prefix
+        messages = [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": gen_code_prompt},
+        ]
+        code_parts = []
+        printer = StreamPrinter(enabled=echo)
 
-        print("\n⏳ Generating code...\n")
+        log("\n⏳ Generating code...\n")
 
         async for display_text, collected_code in self.generate_python_code(messages):
-            print(display_text, end="", flush=True)
-            code_snippet += collected_code
+            printer.write(display_text)
+            code_parts.append(collected_code)
+        printer.flush()
 
-        print()  # newline
+        log()  # newline
+
+        code_reply = "".join(code_parts)
+        messages.append({"role": "assistant", "content": code_reply})
 
         # Clean up code snippet by removing triple backticks
-        code_snippet = self.remove_markdown_code_fences(code_snippet)
+        code_snippet = self.remove_markdown_code_fences(code_reply)
         result["code"] = code_snippet
 
         # -------------
         # 2) Run the code in the sandbox
         # -------------
-        print("\n⏳ Running code in PPIO Agent Sandbox...\n")
+        log("\n⏳ Running code in PPIO Agent Sandbox...\n")
 
-        python_result = self.run_code_in_sandbox(code_snippet)
+        # Shielded so cancelling this run doesn't abandon a sandbox mid-creation
+        await asyncio.shield(sandbox_warmup)
+        python_result = await self.run_code_in_sandbox(code_snippet)
         result["output"] = python_result
 
         # Check if Python returned an error
@@ -210,17 +431,16 @@ class PythonCodeInterpreter:
         result["has_error"] = has_error
         status_emoji = "✅" if not has_error else "❌"
         
-        print(f"**{status_emoji} Code execution output:**\n```text\n{python_result}\n```\n")
+        log(f"**{status_emoji} Code execution output:**\n```text\n{python_result}\n```\n")
 
         # -------------
         # 3) If there's an error, call LLM to help debug
         # -------------
         if has_error:
-            print("\n**Got an error while executing the code. Trying to debug it...**\n")
+            log("\n**Got an error while executing the code. Trying to debug it...**\n")
 
             debug_prompt = (
-                "The following Python code produced an error. "
-                f"Original code:\n{code_snippet}\n\n"
+                "The code produced an error.\n\n"
                 f"Error:\n{python_result}\n\n"
                 "Please provide only the Python code (MUST WITH markdown fences) needed to "
                 "fix the error. "
@@ -228,32 +448,37 @@ class PythonCodeInterpreter:
                 "Do not offer to explain the code. "
             )
             
-            debug_messages = [{"role": "user", "content": debug_prompt}]
-            debug_code_snippet = ""
+            messages.append({"role": "user", "content": debug_prompt})
+            debug_code_parts = []
+            printer = StreamPrinter(enabled=echo)
             
-            async for display_text, collected_code in self.generate_python_code(debug_messages):
-                print(display_text, end="", flush=True)
-                debug_code_snippet += collected_code
+            async for display_text, collected_code in self.generate_python_code(messages):
+                printer.write(display_text)
+                debug_code_parts.append(collected_code)
+            printer.flush()
+
+            log()  # newline
 
-            print()  # newline
+            debug_code_reply = "".join(debug_code_parts)
+            messages.append({"role": "assistant", "content": debug_code_reply})
                 
-            debug_code_snippet = self.remove_markdown_code_fences(debug_code_snippet)
+            debug_code_snippet = self.remove_markdown_code_fences(debug_code_reply)
             result["debug_code"] = debug_code_snippet
 
-            print("\n⏳ Running the fixed code in PPIO Agent Sandbox...\n")
+            log("\n⏳ Running the fixed code in PPIO Agent Sandbox...\n")
 
-            python_debug_result = self.run_code_in_sandbox(debug_code_snippet)
+            python_debug_result = await self.run_code_in_sandbox(debug_code_snippet)
             has_error = self.has_error(python_debug_result)
             result["has_error"] = has_error
             result["output"] = python_debug_result
             status_emoji = "✅" if not has_error else "❌"
             
-            print(f"**{status_emoji} Code execution output:**\n```text\n{python_debug_result}\n```\n")
+            log(f"**{status_emoji} Code execution output:**\n```text\n{python_debug_result}\n```\n")
 
             # If we still have error, just give up and display it
             if has_error:
-                print("---\n## Summary\n")
-                print(
+                log("---\n## Summary\n")
+                log(
                     "**It seems we have another error even after debugging:**\n\n"
                     f"```text\n{python_debug_result}\n```\n\n"
                     "You can try refining your request or debugging further."
@@ -262,57 +487,51 @@ class PythonCodeInterpreter:
                 return result
             else:
                 # Summarize the result after successful debug
-                print("---\n## Summary\n")
+                log("---\n## Summary\n")
                 
                 summary_prompt = (
-                    "The original user request was:\n"
-                    f"{user_message}\n\n"
-                    "The code that was generated and run was:\n"
-                    f"{code_snippet}\n\n"
-                    "But we got an error. So we debugged it and ran the following code:\n"
-                    f"{debug_code_snippet}\n\n"
-                    "The output of the code was:\n"
+                    "The fixed code ran successfully. The output of the code was:\n"
                     f"{python_debug_result}\n\n"
                     "Please summarize the output of the code. "
                 )
                 
-                summary_messages = [{"role": "user", "content": summary_prompt}]
-                summary = ""
+                messages.append({"role": "user", "content": summary_prompt})
+                summary_parts = []
+                printer = StreamPrinter(enabled=echo)
                 
-                async for text in self.generate_summary(summary_messages):
-                    print(text, end="", flush=True)
-                    summary += text
+                async for text in self.generate_summary(messages):
+                    printer.write(text)
+                    summary_parts.append(text)
+                printer.flush()
 
-                print()  # newline
+                log()  # newline
 
-                result["summary"] = summary
+                result["summary"] = "".join(summary_parts)
                 return result
         else:
             # -------------
             # 4) If there's no error, summarize the result
             # -------------
-            print("---\n## Summary\n")
+            log("---\n## Summary\n")
             
             summary_prompt = (
-                "The original user request was:\n"
-                f"{user_message}\n\n"
-                "The code that was generated and run was:\n"
-                f"{code_snippet}\n\n"
-                "The output of the code was:\n"
+                "The code ran successfully. The output of the code was:\n"
                 f"{python_result}\n\n"
                 "Please summarize the output of the code. "
             )
             
-            summary_messages = [{"role": "user", "content": summary_prompt}]
-            summary = ""
+            messages.append({"role": "user", "content": summary_prompt})
+            summary_parts = []
+            printer = StreamPrinter(enabled=echo)
             
-            async for text in self.generate_summary(summary_messages):
-                summary += text
-                print(text, end="", flush=True)
+            async for text in self.generate_summary(messages):
+                printer.write(text)
+                summary_parts.append(text)
+            printer.flush()
 
-            print()  # newline
+            log()  # newline
             
-            result["summary"] = summary
+            result["summary"] = "".join(summary_parts)
             return result
 
 
@@ -325,6 +544,26 @@ async def main():
     # - PPIO_API_KEY: Your PPIO API key
     
     interpreter = PythonCodeInterpreter()
+    try:
+        await repl(interpreter)
+    finally:
+        await interpreter.aclose()
+
+
+def print_run_details(result: Dict[str, Any]) -> None:
+    """Print the code, output and summary of a run that was executed with echo=False"""
+    print(f"\n**Code:**\n```python\n{result['code']}\n```")
+    if result.get('debug_code'):
+        print(f"\n**Fixed code:**\n```python\n{result['debug_code']}\n```")
+    status_emoji = "✅" if not result['has_error'] else "❌"
+    print(f"\n**{status_emoji} Code execution output:**\n```text\n{result['output']}\n```")
+    print(f"\n## Summary\n\n{result['summary']}")
+
+
+async def repl(interpreter: PythonCodeInterpreter):
+    """
+    Interactive prompt loop
+    """
 
     # Example user prompts
     examples = [
@@ -340,7 +579,8 @@ async def main():
     print("\nYou can either:")
     print("1. Try one of the example prompts")
     print("2. Enter your own prompt")
-    print("3. Type 'quit' to exit\n")
+    print("3. Enter 'batch:' followed by prompts separated by '|' to run them concurrently")
+    print("4. Type 'quit' to exit\n")
 
     while True:
         print("\n" + "-" * 80)
@@ -356,28 +596,53 @@ async def main():
             print("\nGoodbye!")
             break
         
-        if user_input.isdigit() and 1 <= int(user_input) <= len(examples):
-            prompt = examples[int(user_input) - 1]
-            print(f"\nUsing example: {prompt}")
+        batch = user_input.lower().startswith("batch:")
+        if batch:
+            prompts = [p.strip() for p in user_input[len("batch:"):].split("|") if p.strip()]
+            if not prompts:
+                print("Please enter at least one prompt after 'batch:'.")
+                continue
+            print(f"\nRunning {len(prompts)} prompts concurrently")
+        elif user_input.isdigit() and 1 <= int(user_input) <= len(examples):
+            prompts = [examples[int(user_input) - 1]]
+            print(f"\nUsing example: {prompts[0]}")
         elif user_input:
-            prompt = user_input
+            prompts = [user_input]
         else:
             print("Please enter a valid prompt or number.")
             continue
 
         try:
-            # Execute the code generation and execution workflow
-            result = await interpreter.run(prompt)
+            # Execute the code generation and execution workflow. Batch runs don't
+            # stream, otherwise their output would be interleaved chunk by chunk
+            results = await asyncio.gather(
+                *(interpreter.run(prompt, echo=not batch) for prompt in prompts),
+                return_exceptions=True,
+            )
             
-            # Print result summary
-            print("\n" + "=" * 80)
-            print("EXECUTION RESULT SUMMARY:")
-            print("=" * 80)
-            print(f"User Request: {result['user_message']}")
-            print(f"Has Error: {result['has_error']}")
-            if result.get('debug_code'):
-                print(f"Required Debugging: Yes")
-            print("=" * 80)
+            for index, (prompt, result) in enumerate(zip(prompts, results), 1):
+                if batch:
+                    print("\n" + "#" * 80)
+                    print(f"[{index}/{len(prompts)}] {prompt}")
+                    print("#" * 80)
+
+                if isinstance(result, Exception):
+                    print(f"Error during execution: {result}")
+                    print(f"\n❌ Error: {result}")
+                    continue
+
+                if batch:
+                    print_run_details(result)
+
+                # Print result summary
+                print("\n" + "=" * 80)
+                print("EXECUTION RESULT SUMMARY:")
+                print("=" * 80)
+                print(f"User Request: {result['user_message']}")
+                print(f"Has Error: {result['has_error']}")
+                if result.get('debug_code'):
+                    print(f"Required Debugging: Yes")
+                print("=" * 80)
             
         except KeyboardInterrupt:
             print("\n\nInterrupted by user.")